@@ -1,9 +1,19 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
-from datetime import datetime, date
+import pyarrow as pa
+import pyarrow.parquet as pq
+import json
+import os
+import re
+import uuid
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import statsapi
-from pybaseball import playerid_reverse_lookup, statcast_pitcher, statcast_batter
+from pybaseball import chadwick_register, statcast_pitcher, statcast_batter
 import feedparser
 import pytz
 
@@ -11,13 +21,20 @@ import pytz
 TOKYO_START   = datetime(2025, 3, 18)
 TOKYO_2       = datetime(2025, 3, 19)
 REGULAR_START = datetime(2025, 3, 27)
+TOKYO_MASK_DATES = pd.DatetimeIndex([TOKYO_START, TOKYO_2])
+REGULAR_START_MS = int(pd.Timestamp(REGULAR_START).value // 10**6)
+DAY_AXIS = alt.Axis(
+    tickMinStep=1,
+    labelExpr=f"utcFormat({REGULAR_START_MS} + datum.value * 86400000, '%m-%d')"
+)
 ROYAL_BLUE = "#1E90FF"
 ORANGE     = "#FF8000"
 
 st.set_page_config(layout="wide", page_title="MLB 2025 Tracker")
 
 # --- NEWS (RSS-based) ---
-def fetch_mlb_news_rss():
+@st.cache_data(ttl=10 * 60, show_spinner=False)
+def fetch_mlb_news_rss() -> list[dict]:
     url = "https://www.mlb.com/feeds/news/rss.xml"
     feed = feedparser.parse(url)
     articles = []
@@ -30,49 +47,41 @@ def fetch_mlb_news_rss():
         })
     return articles
 
+TEASER_RE = re.compile(r'vote|voting|check back|countdown|announcement', re.I)
+
 def is_valid_news(article):
-    teaser_keywords = ["vote", "voting", "check back", "countdown", "announcement"]
-    content = (article["title"] + " " + article["summary"]).lower()
-    if any(kw in content for kw in teaser_keywords):
+    if TEASER_RE.search(article["title"]) or TEASER_RE.search(article["summary"]):
         return False
     if len(article["summary"].strip()) == 0 and len(article["title"].strip()) == 0:
         return False
     return True
 
-# --- TEAM INFO ---
-@st.cache_data(ttl=12 * 60 * 60)
-def get_team_info():
-    teams_raw = statsapi.get('teams', {'sportIds': 1})['teams']
-    team_info = {}
-    for t in teams_raw:
-        if t['active']:
-            abbr = t['abbreviation']
-            team_info[abbr] = {
-                'id': t['id'],
-                'name': t['name'],
-                'logo': f"https://www.mlbstatic.com/team-logos/{t['id']}.svg",
-                'slug': t.get('teamName', '').lower().replace(' ', '-'),
-                'division': t['division']['name']
-            }
-    return team_info
-
-team_info = get_team_info()
-team_abbrs = sorted(team_info.keys())
-team_names = [team_info[a]['name'] for a in team_abbrs]
-abbr_by_name = {team_info[a]['name']: a for a in team_abbrs}
-
-# --- PLAYERS ---
+# --- TEAM INFO & PLAYERS ---
 @st.cache_data(ttl=12 * 60 * 60)
-def build_rosters():
+def load_league():
     teams_raw = statsapi.get('teams', {'sportIds': 1})['teams']
     active_teams = [t for t in teams_raw if t['active']]
+    team_info = {}
+    for t in active_teams:
+        abbr = t['abbreviation']
+        team_info[abbr] = {
+            'id': t['id'],
+            'name': t['name'],
+            'logo': f"https://www.mlbstatic.com/team-logos/{t['id']}.svg",
+            'slug': t.get('teamName', '').lower().replace(' ', '-'),
+            'division': t['division']['name']
+        }
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        rosters = list(ex.map(
+            lambda team: (team, statsapi.get('team_roster', {
+                'teamId': team['id'],
+                'rosterType': 'active'
+            })),
+            active_teams
+        ))
     batters = []
     pitchers = []
-    for team in active_teams:
-        data = statsapi.get('team_roster', {
-            'teamId': team['id'],
-            'rosterType': 'active'
-        })
+    for team, data in rosters:
         for player in data.get('roster', []):
             person = player.get('person', {})
             name   = person.get('fullName')
@@ -83,9 +92,13 @@ def build_rosters():
                     pitchers.append((name, pid, team['abbreviation']))
                 else:
                     batters.append((name, pid, team['abbreviation']))
-    return batters, pitchers
+    return team_info, batters, pitchers
+
+team_info, batters, pitchers = load_league()
+team_abbrs = sorted(team_info.keys())
+team_names = [team_info[a]['name'] for a in team_abbrs]
+abbr_by_name = {team_info[a]['name']: a for a in team_abbrs}
 
-batters, pitchers = build_rosters()
 batter_map  = {name: (pid, team) for name, pid, team in batters}
 pitcher_map = {name: (pid, team) for name, pid, team in pitchers}
 
@@ -97,78 +110,384 @@ if OTANI_NAME not in pitcher_map:
     pitchers.insert(0, (OTANI_NAME, OTANI_ID, OTANI_TEAM))
     pitcher_map[OTANI_NAME] = (OTANI_ID, OTANI_TEAM)
 
+batters_by_team = defaultdict(list)
+for name, _, team in batters:
+    batters_by_team[team].append(name)
+pitchers_by_team = defaultdict(list)
+for name, _, team in pitchers:
+    pitchers_by_team[team].append(name)
+
+# --- TEAM LINKS (sidebar) ---
+DIVISION_NAME_MAP = {
+    'American League East': ('American League', 'East'),
+    'American League Central': ('American League', 'Central'),
+    'American League West': ('American League', 'West'),
+    'National League East': ('National League', 'East'),
+    'National League Central': ('National League', 'Central'),
+    'National League West': ('National League', 'West')
+}
+
+@st.cache_data
+def build_division_html(team_info: dict) -> dict[str, dict[str, str]]:
+    division_map = {
+        'American League': {'East': [], 'Central': [], 'West': []},
+        'National League': {'East': [], 'Central': [], 'West': []}
+    }
+    for abbr in sorted(team_info):
+        info = team_info[abbr]
+        league, division = DIVISION_NAME_MAP[info['division']]
+        url = f"https://www.mlb.com/{info['slug']}"
+        entry = (
+            f'<a href="{url}" target="_blank">'
+            f'<img src="{info["logo"]}" width="22" style="vertical-align:middle;margin-right:4px;">'
+            f'{abbr}</a>'
+        )
+        division_map[league][division].append(entry)
+    col_count = 6
+    html_map = {}
+    for league, divisions in division_map.items():
+        html_map[league] = {}
+        for division, entries in divisions.items():
+            if not entries:
+                continue
+            rows = [entries[i:i+col_count] for i in range(0, len(entries), col_count)]
+            table_html = '<table style="border-collapse:collapse;border:none;">'
+            for row in rows:
+                table_html += '<tr style="border:none;">' + ''.join(
+                    f'<td style="padding:2px 8px;border:none;background:transparent;">{cell}</td>' for cell in row
+                ) + '</tr>'
+            table_html += '</table>'
+            html_map[league][division] = f"**{division}**\n\n{table_html}"
+    return html_map
+
 # --- PLAYER IMAGE ---
 def get_player_image(pid: int) -> str:
     return (f"https://img.mlbstatic.com/mlb-photos/image/upload/"
             f"w_180,q_100/v1/people/{pid}/headshot/67/current.png")
 
+# --- NAME LOOKUP ---
+# Only the sorted key/name arrays are kept; the full register is dropped after indexing
+@st.cache_resource(show_spinner=False)
+def chadwick_index() -> tuple[np.ndarray, np.ndarray]:
+    register = chadwick_register()
+    register = register[register['key_mlbam'].notna()]
+    keys = register['key_mlbam'].to_numpy(dtype=np.int64)
+    names = (register['name_first'].fillna('') + ' ' + register['name_last'].fillna('')).to_numpy(dtype=object)
+    order = np.argsort(keys, kind='stable')
+    return keys[order], names[order]
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def resolve_names(id_tuple: tuple[int, ...]) -> dict[int, str]:
+    if not id_tuple:
+        return {}
+    sorted_keys, sorted_names = chadwick_index()
+    if len(sorted_keys) == 0:
+        return {}
+    pids = np.asarray(id_tuple, dtype=np.int64)
+    idx = np.minimum(np.searchsorted(sorted_keys, pids), len(sorted_keys) - 1)
+    valid = sorted_keys[idx] == pids
+    return dict(zip(pids[valid].tolist(), sorted_names[idx[valid]].tolist()))
+
+# Resolved outside the cached fetches so a failed register load is retried on the next run
+def attach_names(df: pd.DataFrame, id_col: str, name_col: str) -> pd.DataFrame:
+    if df.empty:
+        return df
+    ids = df[id_col].dropna().astype(int)
+    try:
+        name_by_id = resolve_names(tuple(sorted(set(ids.tolist()))))
+    except Exception:
+        name_by_id = {}
+    df[name_col] = df[id_col].map(name_by_id).fillna(ids.astype(str)).fillna('')
+    return df
+
 # --- DATA FETCH ---
-def fetch_hr_log(pid: int, start: datetime, end: datetime, team_abbr: str) -> pd.DataFrame:
-    df = statcast_batter(
-        start_dt=start.strftime('%Y-%m-%d'),
-        end_dt=end.strftime('%Y-%m-%d'),
-        player_id=str(pid)
-    )
+CACHE_DIR = Path("cache")
+STATCAST_SETTLE_DAYS = 2
+STATCAST_RANGE_KEY = b"statcast_range"
+HR_COLS = ['game_date', 'events', 'pitcher', 'home_team', 'away_team']
+K_COLS  = ['game_date', 'events', 'batter', 'home_team', 'away_team']
+HR_VIEW_COLS = ['HR No', 'MM-DD', 'home_team', 'away_team', 'Pitcher']
+K_VIEW_COLS  = ['K No', 'MM-DD', 'home_team', 'away_team', 'Batter']
+
+def _read_statcast_cache(data_path: Path):
+    try:
+        table = pq.read_table(data_path)
+        cached_range = json.loads((table.schema.metadata or {})[STATCAST_RANGE_KEY])
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None, None
+    return table.to_pandas(), cached_range
+
+# The cached date range lives in the Parquet schema metadata, so one os.replace swaps rows and range together
+def _write_statcast_cache(df: pd.DataFrame, data_path: Path, start_iso: str, end_iso: str):
+    tmp_path = data_path.with_name(f"{data_path.stem}.{uuid.uuid4().hex}.tmp")
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[STATCAST_RANGE_KEY] = json.dumps({'start': start_iso, 'end': end_iso}).encode()
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, data_path)
+    except (OSError, pa.ArrowException):
+        tmp_path.unlink(missing_ok=True)
+
+def _fetch_statcast_range(fetch, pid: int, start_iso: str, end_iso: str, cols: list[str]) -> pd.DataFrame:
+    df = fetch(start_dt=start_iso, end_dt=end_iso, player_id=str(pid))
+    return df[cols] if not df.empty else pd.DataFrame(columns=cols)
+
+# Disk cache: only days at least STATCAST_SETTLE_DAYS old (US Eastern) are persisted, and the
+# last STATCAST_SETTLE_DAYS cached days are re-queried whenever the range is extended
+def load_statcast(fetch, kind: str, pid: int, start_iso: str, end_iso: str, cols: list[str]) -> pd.DataFrame:
+    data_path = CACHE_DIR / f"statcast_{kind}_{pid}.parquet"
+    today_et = datetime.now(pytz.timezone('America/New_York')).date()
+    settled_end = (today_et - timedelta(days=STATCAST_SETTLE_DAYS)).isoformat()
+    cached, cached_range = _read_statcast_cache(data_path)
+
+    if cached is None:
+        df = _fetch_statcast_range(fetch, pid, start_iso, end_iso, cols)
+        cache_start, cache_end = start_iso, min(end_iso, settled_end)
+    elif cached_range['start'] <= start_iso and end_iso <= cached_range['end']:
+        df = cached
+        cache_start = None
+    else:
+        head = tail = None
+        if start_iso < cached_range['start']:
+            head_end = (date.fromisoformat(cached_range['start']) - timedelta(days=1)).isoformat()
+            head = _fetch_statcast_range(fetch, pid, start_iso, head_end, cols)
+        if end_iso > cached_range['end']:
+            refetch_from = date.fromisoformat(cached_range['end']) - timedelta(days=STATCAST_SETTLE_DAYS - 1)
+            tail_start = max(cached_range['start'], refetch_from.isoformat())
+            cached = cached[cached['game_date'].astype(str).str[:10] < tail_start]
+            tail = _fetch_statcast_range(fetch, pid, tail_start, end_iso, cols)
+        df = pd.concat([p for p in (head, cached, tail) if p is not None], ignore_index=True)
+        cache_start = min(start_iso, cached_range['start'])
+        cache_end = max(cached_range['end'], min(end_iso, settled_end))
+
+    if cache_start is not None and cache_end >= cache_start:
+        game_dates = df['game_date'].astype(str).str[:10]
+        _write_statcast_cache(df[game_dates <= cache_end], data_path, cache_start, cache_end)
+
+    game_dates = df['game_date'].astype(str).str[:10]
+    return df[(game_dates >= start_iso) & (game_dates <= end_iso)].reset_index(drop=True)
+
+def to_day_index(dates: pd.Series) -> np.ndarray:
+    return ((dates.to_numpy('datetime64[D]') - np.datetime64(REGULAR_START.date()))
+            .astype(np.int64).astype(np.int16))
+
+def mmdd(dates: pd.Series) -> np.ndarray:
+    m = np.char.zfill(dates.dt.month.to_numpy().astype(str), 2)
+    d = np.char.zfill(dates.dt.day.to_numpy().astype(str), 2)
+    return np.char.add(m, np.char.add('-', d))
+
+@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
+def fetch_hr_log(pid: int, start_iso: str, end_iso: str, team_abbr: str) -> pd.DataFrame:
+    df = load_statcast(statcast_batter, 'hr', pid, start_iso, end_iso, HR_COLS)
     if df.empty:
         return df
-    df['Date'] = pd.to_datetime(df['game_date'])
-    tokyo_days = [TOKYO_START, TOKYO_2]
+    df['Date'] = pd.to_datetime(df['game_date'], format='%Y-%m-%d', cache=True)
+    dates = df['Date'].to_numpy('datetime64[ns]')
+    mask = dates >= np.datetime64(REGULAR_START)
     if team_abbr in {'LAD', 'CHC'}:
-        mask = df['Date'].isin(tokyo_days) | (df['Date'] >= REGULAR_START)
-    else:
-        mask = df['Date'] >= REGULAR_START
-    df = df.loc[mask]
-    df_hr = (df[df['events'] == 'home_run']
-             .copy()
-             .sort_values('Date')
-             .reset_index(drop=True))
+        mask |= np.isin(dates, TOKYO_MASK_DATES.values)
+    df = df.iloc[mask]
+    idx = np.flatnonzero(df['events'].to_numpy() == 'home_run')
+    df_hr = df.iloc[idx].reset_index(drop=True)
+    if not df_hr['Date'].is_monotonic_increasing:
+        df_hr = df_hr.sort_values('Date', ignore_index=True)
     if df_hr.empty:
         return df_hr
     df_hr['HR No'] = df_hr.index + 1
-    df_hr['MM-DD'] = df_hr['Date'].dt.strftime('%m-%d')
-    def pid2name(p):
-        try:
-            t = playerid_reverse_lookup([p], key_type='mlbam')
-            return t['name_first'][0] + ' ' + t['name_last'][0]
-        except Exception:
-            return str(p)
-    df_hr['Pitcher'] = df_hr['pitcher'].apply(
-        lambda x: pid2name(x) if pd.notna(x) else '')
+    df_hr['MM-DD'] = mmdd(df_hr['Date'])
+    df_hr['DayOfSeason'] = to_day_index(df_hr['Date'])
     return df_hr
 
-def fetch_k_log(pid: int, start: datetime, end: datetime, team_abbr: str) -> pd.DataFrame:
-    df = statcast_pitcher(
-        start_dt=start.strftime('%Y-%m-%d'),
-        end_dt=end.strftime('%Y-%m-%d'),
-        player_id=str(pid)
-    )
+@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
+def fetch_k_log(pid: int, start_iso: str, end_iso: str, team_abbr: str) -> pd.DataFrame:
+    df = load_statcast(statcast_pitcher, 'k', pid, start_iso, end_iso, K_COLS)
     if df.empty:
         return df
-    df['Date'] = pd.to_datetime(df['game_date'])
-    tokyo_days = [TOKYO_START, TOKYO_2]
+    df['Date'] = pd.to_datetime(df['game_date'], format='%Y-%m-%d', cache=True)
+    dates = df['Date'].to_numpy('datetime64[ns]')
+    mask = dates >= np.datetime64(REGULAR_START)
     if team_abbr in {'LAD', 'CHC'}:
-        mask = df['Date'].isin(tokyo_days) | (df['Date'] >= REGULAR_START)
-    else:
-        mask = df['Date'] >= REGULAR_START
-    df = df.loc[mask]
-    df_k = (df[df['events'] == 'strikeout']
-             .copy()
-             .sort_values('Date')
-             .reset_index(drop=True))
+        mask |= np.isin(dates, TOKYO_MASK_DATES.values)
+    df = df.iloc[mask]
+    idx = np.flatnonzero(df['events'].to_numpy() == 'strikeout')
+    df_k = df.iloc[idx].reset_index(drop=True)
+    if not df_k['Date'].is_monotonic_increasing:
+        df_k = df_k.sort_values('Date', ignore_index=True)
     if df_k.empty:
         return df_k
     df_k['K No'] = df_k.index + 1
-    df_k['MM-DD'] = df_k['Date'].dt.strftime('%m-%d')
-    def pid2name(p):
-        try:
-            t = playerid_reverse_lookup([p], key_type='mlbam')
-            return t['name_first'][0] + ' ' + t['name_last'][0]
-        except Exception:
-            return str(p)
-    df_k['Batter'] = df_k['batter'].apply(
-        lambda x: pid2name(x) if pd.notna(x) else '')
+    df_k['MM-DD'] = mmdd(df_k['Date'])
+    df_k['DayOfSeason'] = to_day_index(df_k['Date'])
     return df_k
 
+# --- SHARED RENDERING ---
+def render_team_sidebar(team_info: dict):
+    st.sidebar.markdown("#### MLB Teams (official site links)")
+    for league, divisions in build_division_html(team_info).items():
+        st.sidebar.markdown(f"### {league}")
+        for division_html in divisions.values():
+            st.sidebar.markdown(division_html, unsafe_allow_html=True)
+
+def render_no_game_warnings(start_date: date, players: list[tuple[str, str]]):
+    if datetime.combine(start_date, datetime.min.time()) >= REGULAR_START:
+        return
+    for player_name, team_abbr in players:
+        if team_abbr not in {'LAD', 'CHC'}:
+            st.warning(f"No official MLB games for {player_name} ({team_abbr}) before 2025-03-27.")
+
+# --- TRACKER PANELS ---
+@st.fragment
+def render_hr_panels(player1_name: str, team1_abbr: str, player2_name: str, team2_abbr: str):
+    date_col1, date_col2 = st.columns(2)
+    start_date = date_col1.date_input("Start date", TOKYO_START, key="hr_start")
+    end_date   = date_col2.date_input("End date", date.today(), key="hr_end")
+    render_no_game_warnings(start_date, [(player1_name, team1_abbr), (player2_name, team2_abbr)])
+
+    p1_id, team1_code = batter_map[player1_name]
+    p2_id, team2_code = batter_map[player2_name]
+    col1, col2 = st.columns(2)
+    logs = {}
+    color_map = {player1_name: ROYAL_BLUE, player2_name: ORANGE}
+    panels = [
+        (col1, p1_id, player1_name, team1_code),
+        (col2, p2_id, player2_name, team2_code)
+    ]
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        futures = {
+            name: ex.submit(fetch_hr_log, pid, start_date.isoformat(), end_date.isoformat(), code)
+            for _, pid, name, code in panels
+        }
+        for col, pid, name, code in panels:
+            with col:
+                st.markdown(
+                    f"<div style='text-align:center; font-size:1.6em; font-weight:700;'>{name}<br>({team_info[code]['name']})</div>",
+                    unsafe_allow_html=True
+                )
+                st.markdown(
+                    f"<div style='display:flex; justify-content:center;'><img src='{get_player_image(pid)}' width='100' style='margin-bottom:10px;'></div>",
+                    unsafe_allow_html=True
+                )
+                df_hr = attach_names(futures[name].result(), 'pitcher', 'Pitcher')
+                logs[name] = df_hr
+                if df_hr.empty:
+                    st.info("No HR data in selected period.")
+                    continue
+                st.dataframe(
+                    pa.Table.from_pandas(df_hr[HR_VIEW_COLS], preserve_index=False),
+                    use_container_width=True)
+                chart = (alt.Chart(df_hr[['DayOfSeason', 'HR No']])
+                        .mark_line(color=color_map[name], point=alt.OverlayMarkDef(
+                            size=60, filled=True, color=color_map[name]))
+                        .encode(
+                            x=alt.X('DayOfSeason:Q', title='Date (MM-DD)', axis=DAY_AXIS, scale=alt.Scale(zero=False)),
+                            y=alt.Y('HR No:Q', title='Cumulative HRs', axis=alt.Axis(format='d'))
+                        ))
+                st.altair_chart(chart.properties(title=f"{name} HR Pace"), use_container_width=True)
+
+    if all(not logs[n].empty for n in [player1_name, player2_name]):
+        st.subheader("Head-to-Head Comparison")
+        l1, l2 = logs[player1_name], logs[player2_name]
+        merged = pd.DataFrame({
+            'DayOfSeason': np.concatenate([l1['DayOfSeason'].to_numpy(), l2['DayOfSeason'].to_numpy()]),
+            'MM-DD': np.concatenate([l1['MM-DD'].to_numpy(), l2['MM-DD'].to_numpy()]),
+            'HR No': np.concatenate([l1['HR No'].to_numpy(), l2['HR No'].to_numpy()]),
+            'Pitcher': np.concatenate([l1['Pitcher'].to_numpy(), l2['Pitcher'].to_numpy()]),
+            'Player': np.concatenate([np.full(len(l1), player1_name, dtype=object),
+                                      np.full(len(l2), player2_name, dtype=object)])
+        })
+        comparison = (
+            alt.Chart(merged)
+            .mark_line(point=alt.OverlayMarkDef(size=60, filled=True))
+            .encode(
+                x=alt.X('DayOfSeason:Q', title='Date (MM-DD)', axis=DAY_AXIS, scale=alt.Scale(zero=False)),
+                y=alt.Y('HR No:Q', title='Cumulative HRs', axis=alt.Axis(format='d')),
+                color=alt.Color('Player:N', scale=alt.Scale(
+                    domain=[player1_name, player2_name],
+                    range=[ROYAL_BLUE, ORANGE])),
+                tooltip=['Player', 'MM-DD', 'HR No', 'Pitcher']
+            )
+        )
+        st.altair_chart(comparison, use_container_width=True)
+
+    st.caption("Game data: Statcast (pybaseball), Rosters: MLB-StatsAPI | News: MLB.com RSS feed")
+
+@st.fragment
+def render_k_panels(pitcher1_name: str, team1_abbr: str, pitcher2_name: str, team2_abbr: str):
+    date_col1, date_col2 = st.columns(2)
+    start_date = date_col1.date_input("Start date", TOKYO_START, key="k_start")
+    end_date   = date_col2.date_input("End date", date.today(), key="k_end")
+    render_no_game_warnings(start_date, [(pitcher1_name, team1_abbr), (pitcher2_name, team2_abbr)])
+
+    p1_id, team1_code = pitcher_map[pitcher1_name]
+    p2_id, team2_code = pitcher_map[pitcher2_name]
+    col1, col2 = st.columns(2)
+    logs = {}
+    color_map = {pitcher1_name: ROYAL_BLUE, pitcher2_name: ORANGE}
+    panels = [
+        (col1, p1_id, pitcher1_name, team1_code),
+        (col2, p2_id, pitcher2_name, team2_code)
+    ]
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        futures = {
+            name: ex.submit(fetch_k_log, pid, start_date.isoformat(), end_date.isoformat(), code)
+            for _, pid, name, code in panels
+        }
+        for col, pid, name, code in panels:
+            with col:
+                st.markdown(
+                    f"<div style='text-align:center; font-size:1.6em; font-weight:700;'>{name}<br>({team_info[code]['name']})</div>",
+                    unsafe_allow_html=True
+                )
+                st.markdown(
+                    f"<div style='display:flex; justify-content:center;'><img src='{get_player_image(pid)}' width='100' style='margin-bottom:10px;'></div>",
+                    unsafe_allow_html=True
+                )
+                df_k = attach_names(futures[name].result(), 'batter', 'Batter')
+                logs[name] = df_k
+                if df_k.empty:
+                    st.info("No strikeout data in selected period.")
+                    continue
+                st.dataframe(
+                    pa.Table.from_pandas(df_k[K_VIEW_COLS], preserve_index=False),
+                    use_container_width=True)
+                chart = (alt.Chart(df_k[['DayOfSeason', 'K No']])
+                        .mark_line(color=color_map[name], point=alt.OverlayMarkDef(
+                            size=60, filled=True, color=color_map[name]))
+                        .encode(
+                            x=alt.X('DayOfSeason:Q', title='Date (MM-DD)', axis=DAY_AXIS, scale=alt.Scale(zero=False)),
+                            y=alt.Y('K No:Q', title='Cumulative Ks', axis=alt.Axis(format='d'))
+                        ))
+                st.altair_chart(chart.properties(title=f"{name} Strikeout Pace"), use_container_width=True)
+
+    if all(not logs[n].empty for n in [pitcher1_name, pitcher2_name]):
+        st.subheader("Head-to-Head Comparison")
+        l1, l2 = logs[pitcher1_name], logs[pitcher2_name]
+        merged = pd.DataFrame({
+            'DayOfSeason': np.concatenate([l1['DayOfSeason'].to_numpy(), l2['DayOfSeason'].to_numpy()]),
+            'MM-DD': np.concatenate([l1['MM-DD'].to_numpy(), l2['MM-DD'].to_numpy()]),
+            'K No': np.concatenate([l1['K No'].to_numpy(), l2['K No'].to_numpy()]),
+            'Batter': np.concatenate([l1['Batter'].to_numpy(), l2['Batter'].to_numpy()]),
+            'Pitcher': np.concatenate([np.full(len(l1), pitcher1_name, dtype=object),
+                                       np.full(len(l2), pitcher2_name, dtype=object)])
+        })
+        comparison = (
+            alt.Chart(merged)
+            .mark_line(point=alt.OverlayMarkDef(size=60, filled=True))
+            .encode(
+                x=alt.X('DayOfSeason:Q', title='Date (MM-DD)', axis=DAY_AXIS, scale=alt.Scale(zero=False)),
+                y=alt.Y('K No:Q', title='Cumulative Ks', axis=alt.Axis(format='d')),
+                color=alt.Color('Pitcher:N', scale=alt.Scale(
+                    domain=[pitcher1_name, pitcher2_name],
+                    range=[ROYAL_BLUE, ORANGE])),
+                tooltip=['Pitcher', 'MM-DD', 'K No', 'Batter']
+            )
+        )
+        st.altair_chart(comparison, use_container_width=True)
+
+    st.caption("Game data: Statcast (pybaseball), Rosters: MLB-StatsAPI | News: MLB.com RSS feed")
+
 # --- SIDEBAR ---
 tracker = st.sidebar.radio(
     "Select Tracker", 
@@ -178,7 +497,7 @@ tracker = st.sidebar.radio(
 
 # --- MAIN ---
 if tracker == "Home Run Tracker":
-    st.sidebar.header("Select Batters and Date Range")
+    st.sidebar.header("Select Batters")
     st.sidebar.info(
         "Note: Only players currently on the official MLB active roster are shown. "
         "Players not on an active roster will not appear."
@@ -190,7 +509,7 @@ if tracker == "Home Run Tracker":
         index=team_names.index(default_team1) if default_team1 in team_names else 0,
         key="hr_team1")
     team1_abbr = abbr_by_name[team1_name]
-    team1_batters = [n for n, _, t in batters if t == team1_abbr]
+    team1_batters = batters_by_team[team1_abbr]
     default_player1 = "Shohei Ohtani"
     player1_name = st.sidebar.selectbox(
         "First Player", team1_batters,
@@ -203,139 +522,22 @@ if tracker == "Home Run Tracker":
         index=team_names.index(default_team2) if default_team2 in team_names else 0,
         key="hr_team2")
     team2_abbr = abbr_by_name[team2_name]
-    team2_batters = [n for n, _, t in batters if t == team2_abbr]
+    team2_batters = batters_by_team[team2_abbr]
     default_player2 = "Aaron Judge"
     player2_name = st.sidebar.selectbox(
         "Second Player", team2_batters,
         index=team2_batters.index(default_player2) if default_player2 in team2_batters else 0,
         key="hr_player2")
 
-    start_date = st.sidebar.date_input("Start date", TOKYO_START, key="hr_start")
-    end_date   = st.sidebar.date_input("End date", date.today(), key="hr_end")
-
     # MLB Teams Official Links
-    st.sidebar.markdown("#### MLB Teams (official site links)")
-    division_map = {
-        'American League': {'East': [], 'Central': [], 'West': []},
-        'National League': {'East': [], 'Central': [], 'West': []}
-    }
-    division_name_map = {
-        'American League East': ('American League', 'East'),
-        'American League Central': ('American League', 'Central'),
-        'American League West': ('American League', 'West'),
-        'National League East': ('National League', 'East'),
-        'National League Central': ('National League', 'Central'),
-        'National League West': ('National League', 'West')
-    }
-    for abbr in team_abbrs:
-        info = team_info[abbr]
-        div_full = info['division']
-        league, division = division_name_map[div_full]
-        url = f"https://www.mlb.com/{info['slug']}"
-        entry = (
-            f'<a href="{url}" target="_blank">'
-            f'<img src="{info["logo"]}" width="22" style="vertical-align:middle;margin-right:4px;">'
-            f'{abbr}</a>'
-        )
-        division_map[league][division].append(entry)
-    def render_division_block_sidebar(division, entries):
-        st.sidebar.markdown(f"**{division}**")
-        col_count = 6
-        rows = [entries[i:i+col_count] for i in range(0, len(entries), col_count)]
-        table_html = '<table style="border-collapse:collapse;border:none;">'
-        for row in rows:
-            table_html += '<tr style="border:none;">' + ''.join(
-                f'<td style="padding:2px 8px;border:none;background:transparent;">{cell}</td>' for cell in row
-            ) + '</tr>'
-        table_html += '</table>'
-        st.sidebar.markdown(table_html, unsafe_allow_html=True)
-    for league in ['American League', 'National League']:
-        st.sidebar.markdown(f"### {league}")
-        for division in ['East', 'Central', 'West']:
-            entries = division_map[league][division]
-            if entries:
-                render_division_block_sidebar(division, entries)
+    render_team_sidebar(team_info)
 
     # Main content for Home Run Tracker
     st.title("MLB Home Run Pace Comparison — 2025 Season")
-    no_game_msgs = []
-    if team1_abbr not in {'LAD', 'CHC'} and datetime.combine(start_date, datetime.min.time()) < REGULAR_START:
-        no_game_msgs.append(f"No official MLB games for {player1_name} ({team1_abbr}) before 2025-03-27.")
-    if team2_abbr not in {'LAD', 'CHC'} and datetime.combine(start_date, datetime.min.time()) < REGULAR_START:
-        no_game_msgs.append(f"No official MLB games for {player2_name} ({team2_abbr}) before 2025-03-27.")
-    if no_game_msgs:
-        for msg in no_game_msgs:
-            st.warning(msg)
-
-    p1_id, team1_code = batter_map[player1_name]
-    p2_id, team2_code = batter_map[player2_name]
-    col1, col2 = st.columns(2)
-    logs = {}
-    color_map = {player1_name: ROYAL_BLUE, player2_name: ORANGE}
-    for col, pid, name, code in [
-        (col1, p1_id, player1_name, team1_code),
-        (col2, p2_id, player2_name, team2_code)
-    ]:
-        with col:
-            st.markdown(
-                f"<div style='text-align:center; font-size:1.6em; font-weight:700;'>{name}<br>({team_info[code]['name']})</div>",
-                unsafe_allow_html=True
-            )
-            st.markdown(
-                f"<div style='display:flex; justify-content:center;'><img src='{get_player_image(pid)}' width='100' style='margin-bottom:10px;'></div>",
-                unsafe_allow_html=True
-            )
-            df_hr = fetch_hr_log(
-                pid,
-                datetime.combine(start_date, datetime.min.time()),
-                end_date,
-                code
-            )
-            logs[name] = df_hr
-            if df_hr.empty:
-                st.info("No HR data in selected period.")
-                continue
-            st.dataframe(
-                df_hr[['HR No', 'MM-DD', 'home_team', 'away_team', 'Pitcher']],
-                use_container_width=True)
-            chart = (alt.Chart(df_hr)
-                    .mark_line(point=False, color=color_map[name])
-                    .encode(
-                        x=alt.X('Date:T', title='Date (MM-DD)', axis=alt.Axis(format='%m-%d')),
-                        y=alt.Y('HR No:Q', title='Cumulative HRs', axis=alt.Axis(format='d'))
-                    ) +
-                    alt.Chart(df_hr)
-                    .mark_point(size=60, filled=True, color=color_map[name])
-                    .encode(x='Date:T', y='HR No:Q'))
-            st.altair_chart(chart.properties(title=f"{name} HR Pace"), use_container_width=True)
-
-    if all(not logs[n].empty for n in [player1_name, player2_name]):
-        st.subheader("Head-to-Head Comparison")
-        merged = pd.concat([
-            logs[player1_name].assign(Player=player1_name),
-            logs[player2_name].assign(Player=player2_name)
-        ])
-        comparison = (
-            alt.Chart(merged)
-            .mark_line(point=False)
-            .encode(
-                x=alt.X('Date:T', title='Date (MM-DD)', axis=alt.Axis(format='%m-%d')),
-                y=alt.Y('HR No:Q', title='Cumulative HRs', axis=alt.Axis(format='d')),
-                color=alt.Color('Player:N', scale=alt.Scale(
-                    domain=[player1_name, player2_name],
-                    range=[ROYAL_BLUE, ORANGE])),
-                tooltip=['Player', 'Date', 'HR No', 'Pitcher']
-            )
-            + alt.Chart(merged)
-            .mark_point(size=60, filled=True)
-            .encode(x='Date:T', y='HR No:Q', color='Player:N')
-        )
-        st.altair_chart(comparison, use_container_width=True)
-
-    st.caption("Game data: Statcast (pybaseball), Rosters: MLB-StatsAPI | News: MLB.com RSS feed")
+    render_hr_panels(player1_name, team1_abbr, player2_name, team2_abbr)
 
 elif tracker == "Strikeout Tracker":
-    st.sidebar.header("Select Pitchers and Date Range")
+    st.sidebar.header("Select Pitchers")
     st.sidebar.info(
         "Note: Only pitchers currently on the official MLB active roster are shown. "
         "Pitchers not on an active roster will not appear."
@@ -347,7 +549,7 @@ elif tracker == "Strikeout Tracker":
         index=team_names.index(default_team1) if default_team1 in team_names else 0,
         key="k_team1")
     team1_abbr = abbr_by_name[team1_name]
-    team1_pitchers = [n for n, _, t in pitchers if t == team1_abbr]
+    team1_pitchers = pitchers_by_team[team1_abbr]
     if OTANI_NAME not in team1_pitchers and team1_abbr == OTANI_TEAM:
         team1_pitchers.insert(0, OTANI_NAME)
     default_pitcher1 = "Yoshinobu Yamamoto"
@@ -362,136 +564,19 @@ elif tracker == "Strikeout Tracker":
         index=team_names.index(default_team2) if default_team2 in team_names else 0,
         key="k_team2")
     team2_abbr = abbr_by_name[team2_name]
-    team2_pitchers = [n for n, _, t in pitchers if t == team2_abbr]
+    team2_pitchers = pitchers_by_team[team2_abbr]
     default_pitcher2 = "Shota Imanaga"
     pitcher2_name = st.sidebar.selectbox(
         "Second Pitcher", team2_pitchers,
         index=team2_pitchers.index(default_pitcher2) if default_pitcher2 in team2_pitchers else 0,
         key="k_pitcher2")
 
-    start_date = st.sidebar.date_input("Start date", TOKYO_START, key="k_start")
-    end_date   = st.sidebar.date_input("End date", date.today(), key="k_end")
-
     # MLB Teams Official Links
-    st.sidebar.markdown("#### MLB Teams (official site links)")
-    division_map = {
-        'American League': {'East': [], 'Central': [], 'West': []},
-        'National League': {'East': [], 'Central': [], 'West': []}
-    }
-    division_name_map = {
-        'American League East': ('American League', 'East'),
-        'American League Central': ('American League', 'Central'),
-        'American League West': ('American League', 'West'),
-        'National League East': ('National League', 'East'),
-        'National League Central': ('National League', 'Central'),
-        'National League West': ('National League', 'West')
-    }
-    for abbr in team_abbrs:
-        info = team_info[abbr]
-        div_full = info['division']
-        league, division = division_name_map[div_full]
-        url = f"https://www.mlb.com/{info['slug']}"
-        entry = (
-            f'<a href="{url}" target="_blank">'
-            f'<img src="{info["logo"]}" width="22" style="vertical-align:middle;margin-right:4px;">'
-            f'{abbr}</a>'
-        )
-        division_map[league][division].append(entry)
-    def render_division_block_sidebar(division, entries):
-        st.sidebar.markdown(f"**{division}**")
-        col_count = 6
-        rows = [entries[i:i+col_count] for i in range(0, len(entries), col_count)]
-        table_html = '<table style="border-collapse:collapse;border:none;">'
-        for row in rows:
-            table_html += '<tr style="border:none;">' + ''.join(
-                f'<td style="padding:2px 8px;border:none;background:transparent;">{cell}</td>' for cell in row
-            ) + '</tr>'
-        table_html += '</table>'
-        st.sidebar.markdown(table_html, unsafe_allow_html=True)
-    for league in ['American League', 'National League']:
-        st.sidebar.markdown(f"### {league}")
-        for division in ['East', 'Central', 'West']:
-            entries = division_map[league][division]
-            if entries:
-                render_division_block_sidebar(division, entries)
+    render_team_sidebar(team_info)
 
     # Main content for Strikeout Tracker
     st.title("MLB Strikeout Tracker — 2025 Season")
-    no_game_msgs = []
-    if team1_abbr not in {'LAD', 'CHC'} and datetime.combine(start_date, datetime.min.time()) < REGULAR_START:
-        no_game_msgs.append(f"No official MLB games for {pitcher1_name} ({team1_abbr}) before 2025-03-27.")
-    if team2_abbr not in {'LAD', 'CHC'} and datetime.combine(start_date, datetime.min.time()) < REGULAR_START:
-        no_game_msgs.append(f"No official MLB games for {pitcher2_name} ({team2_abbr}) before 2025-03-27.")
-    if no_game_msgs:
-        for msg in no_game_msgs:
-            st.warning(msg)
-
-    p1_id, team1_code = pitcher_map[pitcher1_name]
-    p2_id, team2_code = pitcher_map[pitcher2_name]
-    col1, col2 = st.columns(2)
-    logs = {}
-    color_map = {pitcher1_name: ROYAL_BLUE, pitcher2_name: ORANGE}
-    for col, pid, name, code in [
-        (col1, p1_id, pitcher1_name, team1_code),
-        (col2, p2_id, pitcher2_name, team2_code)
-    ]:
-        with col:
-            st.markdown(
-                f"<div style='text-align:center; font-size:1.6em; font-weight:700;'>{name}<br>({team_info[code]['name']})</div>",
-                unsafe_allow_html=True
-            )
-            st.markdown(
-                f"<div style='display:flex; justify-content:center;'><img src='{get_player_image(pid)}' width='100' style='margin-bottom:10px;'></div>",
-                unsafe_allow_html=True
-            )
-            df_k = fetch_k_log(
-                pid,
-                datetime.combine(start_date, datetime.min.time()),
-                end_date,
-                code
-            )
-            logs[name] = df_k
-            if df_k.empty:
-                st.info("No strikeout data in selected period.")
-                continue
-            st.dataframe(
-                df_k[['K No', 'MM-DD', 'home_team', 'away_team', 'Batter']],
-                use_container_width=True)
-            chart = (alt.Chart(df_k)
-                    .mark_line(point=False, color=color_map[name])
-                    .encode(
-                        x=alt.X('Date:T', title='Date (MM-DD)', axis=alt.Axis(format='%m-%d')),
-                        y=alt.Y('K No:Q', title='Cumulative Ks', axis=alt.Axis(format='d'))
-                    ) +
-                    alt.Chart(df_k)
-                    .mark_point(size=60, filled=True, color=color_map[name])
-                    .encode(x='Date:T', y='K No:Q'))
-            st.altair_chart(chart.properties(title=f"{name} Strikeout Pace"), use_container_width=True)
-
-    if all(not logs[n].empty for n in [pitcher1_name, pitcher2_name]):
-        st.subheader("Head-to-Head Comparison")
-        merged = pd.concat([
-            logs[pitcher1_name].assign(Pitcher=pitcher1_name),
-            logs[pitcher2_name].assign(Pitcher=pitcher2_name)
-        ])
-        comparison = (
-            alt.Chart(merged)
-            .mark_line(point=False)
-            .encode(
-                x=alt.X('Date:T', title='Date (MM-DD)', axis=alt.Axis(format='%m-%d')),
-                y=alt.Y('K No:Q', title='Cumulative Ks', axis=alt.Axis(format='d')),
-                color=alt.Color('Pitcher:N', scale=alt.Scale(
-                    domain=[pitcher1_name, pitcher2_name],
-                    range=[ROYAL_BLUE, ORANGE])),
-                tooltip=['Pitcher', 'Date', 'K No', 'Batter']
-            )
-            + alt.Chart(merged)
-            .mark_point(size=60, filled=True)
-            .encode(x='Date:T', y='K No:Q', color='Pitcher:N')
-        )
-        st.altair_chart(comparison, use_container_width=True)
-
-    st.caption("Game data: Statcast (pybaseball), Rosters: MLB-StatsAPI | News: MLB.com RSS feed")
+    render_k_panels(pitcher1_name, team1_abbr, pitcher2_name, team2_abbr)
 
 # --- MLB NEWS: SIDEBAR BOTTOM ---
 with st.sidebar: